@@ -1,9 +1,19 @@
 """Animation utilities for the overlay."""
 
 import math
-from typing import Tuple
-from PySide6.QtCore import QPropertyAnimation, QEasingCurve, QObject, Property, Signal
+from array import array
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import numpy as np
+from PySide6.QtCore import QAbstractAnimation, QElapsedTimer, QPropertyAnimation, QEasingCurve, QObject, Property, Signal
 from PySide6.QtGui import QColor
+from PySide6.QtWidgets import QWidget
+
+try:
+    from numba import njit
+except ImportError:  # Optional: fall back to plain NumPy
+    njit = None
 
 
 class AnimationController(QObject):
@@ -15,17 +25,27 @@ class AnimationController(QObject):
     rotation_changed = Signal(float)
     color_changed = Signal(QColor)
     
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, window: Optional[QWidget] = None):
         super().__init__(parent)
+        # When bound to a window, opacity is applied as window opacity so the
+        # compositor blends it and fades don't require repainting the content
+        self._window = window
         self._opacity = 1.0
         self._scale = 1.0
         self._rotation = 0.0
         self._color = QColor("#00FFFF")
         
-        # Animation objects
-        self._opacity_anim: QPropertyAnimation = None
-        self._scale_anim: QPropertyAnimation = None
-        self._rotation_anim: QPropertyAnimation = None
+        # Animation objects, created once and reused for every call
+        self._opacity_anim = QPropertyAnimation(self, b"opacity", self)
+        self._opacity_anim.setEasingCurve(QEasingCurve.Type.InOutQuad)
+        
+        self._scale_anim = QPropertyAnimation(self, b"scale", self)
+        self._scale_anim.setEasingCurve(QEasingCurve.Type.OutBack)
+        
+        self._rotation_anim = QPropertyAnimation(self, b"rotation", self)
+        self._rotation_anim.setStartValue(0.0)
+        self._rotation_anim.setEndValue(360.0)
+        self._rotation_anim.setLoopCount(-1)  # Infinite
     
     # Opacity property
     def get_opacity(self) -> float:
@@ -34,6 +54,8 @@ class AnimationController(QObject):
     def set_opacity(self, value: float):
         if self._opacity != value:
             self._opacity = value
+            if self._window is not None:
+                self._window.setWindowOpacity(value)
             self.opacity_changed.emit(value)
     
     opacity = Property(float, get_opacity, set_opacity)
@@ -62,76 +84,87 @@ class AnimationController(QObject):
     
     def fade_to(self, target_opacity: float, duration_ms: int = 300):
         """Animate opacity to target value."""
-        if self._opacity_anim:
-            self._opacity_anim.stop()
-        
-        self._opacity_anim = QPropertyAnimation(self, b"opacity")
+        self._opacity_anim.stop()
         self._opacity_anim.setDuration(duration_ms)
         self._opacity_anim.setStartValue(self._opacity)
         self._opacity_anim.setEndValue(target_opacity)
-        self._opacity_anim.setEasingCurve(QEasingCurve.Type.InOutQuad)
         self._opacity_anim.start()
     
     def scale_to(self, target_scale: float, duration_ms: int = 300):
         """Animate scale to target value."""
-        if self._scale_anim:
-            self._scale_anim.stop()
-        
-        self._scale_anim = QPropertyAnimation(self, b"scale")
+        self._scale_anim.stop()
         self._scale_anim.setDuration(duration_ms)
         self._scale_anim.setStartValue(self._scale)
         self._scale_anim.setEndValue(target_scale)
-        self._scale_anim.setEasingCurve(QEasingCurve.Type.OutBack)
         self._scale_anim.start()
     
     def start_rotation(self, duration_ms: int = 2000):
         """Start continuous rotation."""
-        if self._rotation_anim:
-            self._rotation_anim.stop()
-        
-        self._rotation_anim = QPropertyAnimation(self, b"rotation")
+        self._rotation_anim.stop()
         self._rotation_anim.setDuration(duration_ms)
-        self._rotation_anim.setStartValue(0.0)
-        self._rotation_anim.setEndValue(360.0)
-        self._rotation_anim.setLoopCount(-1)  # Infinite
         self._rotation_anim.start()
     
     def stop_rotation(self):
         """Stop rotation animation."""
-        if self._rotation_anim:
-            self._rotation_anim.stop()
-            self._rotation = 0.0
+        self._rotation_anim.stop()
+        self._rotation = 0.0
+    
+    def is_running(self) -> bool:
+        """Return True if any property animation is currently running."""
+        for anim in (self._opacity_anim, self._scale_anim, self._rotation_anim):
+            if anim.state() == QAbstractAnimation.State.Running:
+                return True
+        return False
     
     def stop_all(self):
         """Stop all animations."""
-        if self._opacity_anim:
-            self._opacity_anim.stop()
-        if self._scale_anim:
-            self._scale_anim.stop()
-        if self._rotation_anim:
-            self._rotation_anim.stop()
+        self._opacity_anim.stop()
+        self._scale_anim.stop()
+        self._rotation_anim.stop()
 
 
 class BreathingAnimation:
     """Breathing pulse effect calculator."""
     
+    LUT_SIZE = 256  # Samples per breathing cycle (power of two)
+    
     def __init__(self, min_value: float = 0.05, max_value: float = 0.1, duration_ms: int = 3000):
         self.min_value = min_value
         self.max_value = max_value
         self.duration_ms = duration_ms
-        self._elapsed = 0
-    
-    def update(self, delta_ms: int) -> float:
-        """Update and return current breathing value."""
-        self._elapsed = (self._elapsed + delta_ms) % self.duration_ms
-        # Sine wave for smooth breathing
-        t = self._elapsed / self.duration_ms
-        value = math.sin(t * 2 * math.pi) * 0.5 + 0.5
-        return self.min_value + value * (self.max_value - self.min_value)
+        self._lut: array = None
+        self._lut_range: Tuple[float, float] = None
+        # Phase comes from a monotonic clock, not from caller-supplied deltas
+        self._clock = QElapsedTimer()
+        self._clock.start()
+    
+    def _build_lut(self):
+        """Precompute one sine breathing cycle for the current value range."""
+        n = self.LUT_SIZE
+        span = self.max_value - self.min_value
+        self._lut = array('f', [
+            self.min_value + (math.sin(2 * math.pi * i / n) * 0.5 + 0.5) * span
+            for i in range(n)
+        ])
+        self._lut_range = (self.min_value, self.max_value)
+    
+    def update(self, delta_ms: int = 0) -> float:
+        """Return current breathing value.
+        
+        delta_ms is ignored (kept for compatibility); the phase is read
+        from the animation's own clock so frame jitter doesn't drift it.
+        """
+        # Rebuild lazily if min/max were changed since the last build
+        if self._lut_range != (self.min_value, self.max_value):
+            self._build_lut()
+        # Steps since start, wrapped to one cycle with a mask instead of %
+        ns = self._clock.nsecsElapsed()
+        idx = (ns * self.LUT_SIZE // (self.duration_ms * 1_000_000)) & (self.LUT_SIZE - 1)
+        return self._lut[idx]
     
     def reset(self):
         """Reset animation to start."""
-        self._elapsed = 0
+        self._clock.restart()
 
 
 class WaveformAnimation:
@@ -141,48 +174,56 @@ class WaveformAnimation:
         self.num_bars = num_bars
         self._phases = [i * (2 * math.pi / num_bars) for i in range(num_bars)]
         self._elapsed = 0
+        # Per-bar height scale: falls off by 0.2 per bar away from center
+        dist = np.abs(np.arange(num_bars) - num_bars // 2)
+        self._scale = (1.0 - dist * 0.2).astype(np.float32)
+        self._heights = np.empty(num_bars, dtype=np.float32)
     
     def update(self, delta_ms: int, audio_level: float = 0.5) -> list:
         """Update and return bar heights (0-1 range)."""
         self._elapsed += delta_ms
         
-        # Make the animation faster/more reactive
-        import random
-        heights = []
-        center_idx = self.num_bars // 2
-        
-        for i in range(self.num_bars):
-            # Distance from center bar
-            dist = abs(center_idx - i)
-            
-            # Base height driven by audio level
-            # Center bars are taller
-            scale = 1.0 - (dist * 0.2) 
-            
-            # Add randomness for "jitter" effect
-            jitter = random.uniform(0.8, 1.2)
-            
-            # Direct mapping from audio level
-            height = audio_level * scale * jitter
-            
-            # Clamp
-            heights.append(max(0.1, min(1.0, height)))
-        
-        return heights
+        # Direct mapping from audio level, center bars taller,
+        # with random "jitter" for a more reactive look
+        jitter = np.random.uniform(0.8, 1.2, self.num_bars).astype(np.float32)
+        if njit is not None:
+            _wave_kernel(self._scale, audio_level, jitter, self._heights)
+        else:
+            np.clip(audio_level * self._scale * jitter, 0.1, 1.0, out=self._heights)
+        return self._heights.tolist()
+
+
+def _wave_kernel(scale, audio_level, jitter, out):
+    """Write clamped bar heights into out (JIT-compiled when numba is available)."""
+    for i in range(out.shape[0]):
+        out[i] = min(1.0, max(0.1, audio_level * scale[i] * jitter[i]))
+
+
+if njit is not None:
+    _wave_kernel = njit(cache=True, fastmath=True)(_wave_kernel)
+
+
+@lru_cache(maxsize=64)
+def _lerp_rgba(rgba1: int, rgba2: int, t8: int) -> int:
+    """Lerp two packed 0xAARRGGBB values, two byte lanes per multiply."""
+    rb1 = rgba1 & 0x00FF00FF
+    ag1 = (rgba1 & 0xFF00FF00) >> 8
+    rb2 = rgba2 & 0x00FF00FF
+    ag2 = (rgba2 & 0xFF00FF00) >> 8
+    rb = (rb1 + (((rb2 - rb1) * t8) >> 8)) & 0x00FF00FF
+    ag = ((ag1 + (((ag2 - ag1) * t8) >> 8)) << 8) & 0xFF00FF00
+    return rb | ag
 
 
 def interpolate_color(color1: QColor, color2: QColor, t: float) -> QColor:
     """Interpolate between two colors."""
-    t = max(0.0, min(1.0, t))
-    r = int(color1.red() + (color2.red() - color1.red()) * t)
-    g = int(color1.green() + (color2.green() - color1.green()) * t)
-    b = int(color1.blue() + (color2.blue() - color1.blue()) * t)
-    a = int(color1.alpha() + (color2.alpha() - color1.alpha()) * t)
-    return QColor(r, g, b, a)
+    t8 = max(0, min(256, int(t * 256)))
+    return QColor.fromRgba(_lerp_rgba(color1.rgba(), color2.rgba(), t8))
 
 
 def ease_in_out_quad(t: float) -> float:
     """Quadratic ease in/out function."""
     if t < 0.5:
         return 2 * t * t
-    return 1 - pow(-2 * t + 2, 2) / 2
+    u = -2 * t + 2
+    return 1 - u * u / 2
@@ -3,9 +3,18 @@ import sys
 import subprocess
 import webbrowser
 import pyautogui
+import threading
 import time
 from typing import Tuple
 
+try:
+    import pyperclip  # Installed alongside pyautogui
+except ImportError:
+    pyperclip = None
+
+# Text at least this long is pasted via the clipboard rather than typed
+PASTE_MIN_LENGTH = 8
+
 class CommandProcessor:
     """Processes recognized text and executes system commands."""
     
@@ -25,6 +34,15 @@ class CommandProcessor:
             "whatsapp": "whatsapp:",  # Windows protocol handler
             "spotify": "spotify:",
         }
+        
+        # Command verbs (first word) -> handler receiving the rest of the text
+        self._verbs = {
+            "open": self._open_app,
+            "search": self._web_search,
+            "google": self._web_search,
+            "type": self.type_text,
+            "write": self.type_text,
+        }
 
     def process(self, text: str) -> Tuple[str, str]:
         """
@@ -33,23 +51,15 @@ class CommandProcessor:
         """
         text = text.lower().strip()
         
-        # 1. Open Applications
-        if text.startswith("open "):
-            app_name = text[5:].strip()
-            return self._open_app(app_name)
-            
-        # 2. Web Search
-        elif text.startswith("search ") or text.startswith("google "):
-            query = text.replace("search ", "", 1).replace("google ", "", 1).strip()
-            return self._web_search(query)
-            
-        # 3. Typing / Coding
-        elif text.startswith("type ") or text.startswith("write "):
-            content = text.replace("type ", "", 1).replace("write ", "", 1)
-            return self.type_text(content)
+        # 1-3. Open / search / type: dispatch on the first word
+        verb, _, rest = text.partition(" ")
+        handler = self._verbs.get(verb)
+        rest = rest.strip()
+        if handler and rest:
+            return handler(rest)
             
         # 4. Keypad
-        elif "keypad" in text:
+        if "keypad" in text:
             return "keypad", "Opening Keypad..."
             
         # Default: Just return what was said (maybe user just wants to see it)
@@ -90,7 +100,18 @@ class CommandProcessor:
 
     def type_text(self, text: str) -> Tuple[str, str]:
         """Type text into the active window."""
-        # Small delay to ensure focus is correct (though voice overlay shouldn't steal focus)
+        # Longer text is pasted in one go instead of typed key by key
+        if len(text) >= PASTE_MIN_LENGTH and pyperclip is not None:
+            try:
+                previous = pyperclip.paste()
+                pyperclip.copy(text)
+                pyautogui.hotkey('ctrl', 'v')
+                # Restore the user's clipboard once the paste has landed
+                threading.Timer(0.2, pyperclip.copy, args=(previous,)).start()
+                return "typed", f"Typed: {text}"
+            except pyperclip.PyperclipException:
+                pass  # No clipboard available, type it instead
+        
         # pyautogui.write types distinct characters.
-        pyautogui.write(text, interval=0.01)
+        pyautogui.write(text, interval=0)
         return "typed", f"Typed: {text}"
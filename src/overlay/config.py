@@ -2,7 +2,11 @@
 
 from enum import Enum, auto
 from dataclasses import dataclass, field
-from typing import Tuple
+from functools import lru_cache
+from typing import Dict, Tuple
+
+import numpy as np
+from PySide6.QtGui import QColor
 
 
 class Position(Enum):
@@ -23,9 +27,24 @@ class AccessibilityMode(Enum):
     AUDIO_ONLY = auto()  # No visuals
 
 
-@dataclass
+def _parse_color(value: str) -> QColor:
+    """Parse a hex/named color or a CSS style "rgba(r,g,b,a)" string."""
+    if value.startswith("rgba("):
+        r, g, b, a = (part.strip() for part in value[5:-1].split(","))
+        color = QColor(int(r), int(g), int(b))
+        color.setAlphaF(float(a))
+        return color
+    return QColor(value)
+
+
+@dataclass(frozen=True)
 class ColorScheme:
-    """Color scheme for overlay elements."""
+    """Color scheme for overlay elements.
+    
+    Each color string is parsed once into a matching `<name>_q` QColor.
+    These are shared, so copy them (QColor(scheme.listening_q)) before
+    changing alpha.
+    """
     primary_glow: str = "#00FFFF"      # Soft cyan
     listening: str = "#4A90D9"          # Blue
     processing: str = "#9B59B6"         # Purple
@@ -33,6 +52,40 @@ class ColorScheme:
     action_text: str = "#FFFFFF"
     gesture_highlight: str = "#2ECC71"  # Green
     
+    # Parsed colors, set in __post_init__
+    primary_glow_q: QColor = field(init=False, repr=False, compare=False)
+    listening_q: QColor = field(init=False, repr=False, compare=False)
+    processing_q: QColor = field(init=False, repr=False, compare=False)
+    action_bg_q: QColor = field(init=False, repr=False, compare=False)
+    action_text_q: QColor = field(init=False, repr=False, compare=False)
+    gesture_highlight_q: QColor = field(init=False, repr=False, compare=False)
+    
+    # Blend tables built by build_lut, keyed by (start, end) color names
+    _color_luts: Dict[Tuple[str, str], np.ndarray] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    
+    def __post_init__(self):
+        for name in ("primary_glow", "listening", "processing",
+                     "action_bg", "action_text", "gesture_highlight"):
+            object.__setattr__(self, f"{name}_q", _parse_color(getattr(self, name)))
+    
+    def build_lut(self, start: str, end: str) -> np.ndarray:
+        """Return 256 packed 0xAARRGGBB steps blending color `start` into `end`.
+        
+        Index with int(t * 255) and convert with QColor.fromRgba(int(...)).
+        """
+        key = (start, end)
+        lut = self._color_luts.get(key)
+        if lut is None:
+            c1 = np.array(getattr(self, f"{start}_q").getRgb(), dtype=np.float64)
+            c2 = np.array(getattr(self, f"{end}_q").getRgb(), dtype=np.float64)
+            t = np.linspace(0.0, 1.0, 256)[:, None]
+            r, g, b, a = (c1 + (c2 - c1) * t).astype(np.uint32).T
+            lut = (a << 24) | (r << 16) | (g << 8) | b
+            self._color_luts[key] = lut
+        return lut
+    
 
 @dataclass
 class OverlayConfig:
@@ -62,16 +115,19 @@ class OverlayConfig:
     
     def get_screen_position(self, screen_width: int, screen_height: int) -> Tuple[int, int]:
         """Calculate overlay position based on screen size."""
-        margin = self.margin
-        size = self.indicator_size
-        
-        positions = {
-            Position.BOTTOM_RIGHT: (screen_width - size - margin, screen_height - size - margin),
-            Position.BOTTOM_LEFT: (margin, screen_height - size - margin),
-            Position.BOTTOM_CENTER: ((screen_width - size) // 2, screen_height - size - margin),
-            Position.TOP_RIGHT: (screen_width - size - margin, margin),
-            Position.TOP_LEFT: (margin, margin),
-            Position.CENTER: ((screen_width - size) // 2, (screen_height - size) // 2),
-            Position.FOLLOW_HAND: (screen_width - size - margin, screen_height - size - margin),
-        }
+        positions = _screen_positions(screen_width, screen_height, self.indicator_size, self.margin)
         return positions.get(self.position, positions[Position.BOTTOM_RIGHT])
+
+
+@lru_cache(maxsize=8)
+def _screen_positions(screen_width: int, screen_height: int, size: int, margin: int) -> Dict[Position, Tuple[int, int]]:
+    """Top-left corner of the indicator for every position (cached per screen/size)."""
+    return {
+        Position.BOTTOM_RIGHT: (screen_width - size - margin, screen_height - size - margin),
+        Position.BOTTOM_LEFT: (margin, screen_height - size - margin),
+        Position.BOTTOM_CENTER: ((screen_width - size) // 2, screen_height - size - margin),
+        Position.TOP_RIGHT: (screen_width - size - margin, margin),
+        Position.TOP_LEFT: (margin, margin),
+        Position.CENTER: ((screen_width - size) // 2, (screen_height - size) // 2),
+        Position.FOLLOW_HAND: (screen_width - size - margin, screen_height - size - margin),
+    }
@@ -2,7 +2,9 @@
 
 import sys
 import random
-from PySide6.QtCore import QTimer
+import pyautogui
+from concurrent.futures import ThreadPoolExecutor
+from PySide6.QtCore import QObject, QTimer, Signal
 from PySide6.QtWidgets import QApplication
 
 from .overlay_window import OverlayWindow
@@ -14,10 +16,28 @@ from .state_machine import OverlayState
 from .voice_input import VoiceInputManager
 from .commands import CommandProcessor
 
-class AirVoiceOverlay:
+class AirVoiceOverlay(QObject):
     """Main application for AirVoice Overlay."""
     
+    # Emitted from the worker pool, delivered on the GUI thread
+    command_processed = Signal(str, str)
+    
+    # Map special keys to pyautogui keys
+    _SPECIAL_MAP = {
+        "space": "space",
+        "enter": "enter",
+        "backspace": "backspace",
+        "tab": "tab",
+        "capslock": "capslock",
+        "shift": "shift", # Toggle or hold? simple press for now
+        "ctrl": "ctrl",
+        "win": "win",
+        "alt": "alt",
+        "fn": None # Skip fn for now
+    }
+    
     def __init__(self):
+        super().__init__()
         self.app = QApplication(sys.argv)
         self.config = OverlayConfig()
         self.overlay = OverlayWindow(self.config)
@@ -26,8 +46,12 @@ class AirVoiceOverlay:
         self.voice_manager = VoiceInputManager()
         self._connect_signals()
         
-        # Command Processor
+        # Command Processor (runs off the GUI thread, app launches can block).
+        # One worker: commands inject keystrokes and use the clipboard, so
+        # they must run one at a time and in order
         self.processor = CommandProcessor()
+        self._pool = ThreadPoolExecutor(max_workers=1)
+        self.command_processed.connect(self._on_command_processed)
         
 
         
@@ -52,9 +76,21 @@ class AirVoiceOverlay:
 
     def _on_text_recognized(self, text: str):
         """Called when text is recognized."""
-        # Process command
-        action, feedback = self.processor.process(text)
-        
+        # Process command in the background
+        self._pool.submit(self._process_command, text)
+
+    def _process_command(self, text: str):
+        """Run a command on a worker thread and report back."""
+        # The future is discarded, so report failures here or they vanish
+        try:
+            action, feedback = self.processor.process(text)
+        except Exception as e:
+            print(f"Error processing command: {e}")
+            action, feedback = "error", f"Command failed: {e}"
+        self.command_processed.emit(action, feedback)
+
+    def _on_command_processed(self, action: str, feedback: str):
+        """Show the result of a processed command."""
         if action == "keypad":
             self.overlay.show_keypad()
             return
@@ -72,28 +108,21 @@ class AirVoiceOverlay:
             self.reset_timer.start(100)
             return
             
-        # Map special keys to pyautogui keys
-        special_map = {
-            "space": "space",
-            "enter": "enter",
-            "backspace": "backspace",
-            "tab": "tab",
-            "capslock": "capslock",
-            "shift": "shift", # Toggle or hold? simple press for now
-            "ctrl": "ctrl",
-            "win": "win",
-            "alt": "alt",
-            "fn": None # Skip fn for now
-        }
-        
-        if key in special_map:
-            mapped = special_map[key]
-            if mapped:
-                import pyautogui
-                pyautogui.press(mapped)
-        else:
-            # Regular typing
-            self.processor.type_text(key)
+        # Same worker as commands, so key input can't interleave with them
+        self._pool.submit(self._send_key, key)
+
+    def _send_key(self, key: str):
+        """Inject a keypad key on the worker thread."""
+        try:
+            if key in self._SPECIAL_MAP:
+                mapped = self._SPECIAL_MAP[key]
+                if mapped:
+                    pyautogui.press(mapped)
+            else:
+                # Regular typing
+                self.processor.type_text(key)
+        except Exception as e:
+            print(f"Error sending key {key!r}: {e}")
 
     def _return_to_listening(self):
         """Return to listening state."""
@@ -107,7 +136,9 @@ class AirVoiceOverlay:
         # Start listening loop
         self.voice_manager.start_listening()
         
-        return self.app.exec()
+        result = self.app.exec()
+        self._pool.shutdown(wait=False)
+        return result
 
 
 def main():
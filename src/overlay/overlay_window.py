@@ -2,8 +2,9 @@
 
 import sys
 from typing import Optional
-from PySide6.QtCore import Qt, QTimer, QRectF, Signal
-from PySide6.QtGui import QPainter, QColor, QScreen
+from PySide6.QtCore import Qt, QElapsedTimer, QTimer, QRect, QRectF, Signal
+from PySide6.QtGui import QPainter, QColor, QOpenGLContext, QScreen, QSurfaceFormat
+from PySide6.QtOpenGLWidgets import QOpenGLWidget
 from PySide6.QtWidgets import QApplication, QWidget
 
 from .state_machine import OverlayState, OverlayStateMachine
@@ -15,48 +16,123 @@ from .phase_renderer import (
 )
 
 
+def _surface_format() -> QSurfaceFormat:
+    """Return the GL surface format for the overlay canvas."""
+    surface_format = QSurfaceFormat()
+    surface_format.setAlphaBufferSize(8)  # Transparent background
+    surface_format.setSamples(4)  # Multisampling for antialiased shapes
+    return surface_format
+
+
+def _opengl_available(surface_format: QSurfaceFormat) -> bool:
+    """Return True if an OpenGL context with the given format can be created."""
+    context = QOpenGLContext()
+    context.setFormat(surface_format)
+    return context.create()
+
+
+class _GLCanvas(QOpenGLWidget):
+    """Canvas that paints through Qt's OpenGL paint engine into a multisampled FBO."""
+    
+    def __init__(self, overlay: "OverlayWindow", surface_format: QSurfaceFormat):
+        super().__init__(overlay)
+        self._overlay = overlay
+        self.setFormat(surface_format)
+        # Blend the translucent GL content over the window
+        self.setAttribute(Qt.WidgetAttribute.WA_AlwaysStackOnTop)
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+    
+    def paintGL(self):
+        """Render the overlay (context and FBO are bound by QOpenGLWidget)."""
+        painter = QPainter(self)
+        self._overlay._paint(painter)
+        painter.end()
+
+
+class _RasterCanvas(QWidget):
+    """Fallback canvas that paints with the raster engine when OpenGL is unavailable."""
+    
+    def __init__(self, overlay: "OverlayWindow"):
+        super().__init__(overlay)
+        self._overlay = overlay
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+    
+    def paintEvent(self, event):
+        """Render the overlay."""
+        painter = QPainter(self)
+        self._overlay._paint(painter)
+        painter.end()
+
+
 class OverlayWindow(QWidget):
-    """Main overlay window - frameless, transparent, always-on-top, click-through."""
+    """Main overlay window - frameless, transparent, always-on-top, click-through.
+    
+    Renderers paint with QPainter as usual onto a child canvas that fills the
+    window: a QOpenGLWidget when an OpenGL context can be created, so drawing
+    goes through Qt's OpenGL paint engine, otherwise a plain raster widget.
+    """
     
     state_changed = Signal(OverlayState, OverlayState)
     
+    FRAME_INTERVAL_MS = 16  # Time between animation frames (~60 Hz)
+    
     def __init__(self, config: Optional[OverlayConfig] = None):
         super().__init__()
         
         self.config = config or OverlayConfig()
         self.state_machine = OverlayStateMachine()
-        self.animation = AnimationController(self)
+        self.animation = AnimationController(self, window=self)
         
-        # Current opacity for rendering
-        self._current_opacity = self.config.idle_opacity
+        # Target window opacity
         self._target_opacity = self.config.idle_opacity
         
-        # Initialize renderers
-        self.renderers = {
-            OverlayState.IDLE: IdleRenderer(self.config, self.state_machine),
-            OverlayState.LISTENING: ListeningRenderer(self.config, self.state_machine),
-            OverlayState.PROCESSING: ProcessingRenderer(self.config, self.state_machine),
-            OverlayState.ACTION: ActionRenderer(self.config, self.state_machine),
-            OverlayState.GESTURE: GestureRenderer(self.config, self.state_machine),
-            OverlayState.KEYPAD: KeypadRenderer(self.config, self.state_machine),
+        # Renderers are created on first use (see _get_renderer)
+        self._renderer_factories = {
+            OverlayState.IDLE: IdleRenderer,
+            OverlayState.LISTENING: ListeningRenderer,
+            OverlayState.PROCESSING: ProcessingRenderer,
+            OverlayState.ACTION: ActionRenderer,
+            OverlayState.GESTURE: GestureRenderer,
+            OverlayState.KEYPAD: KeypadRenderer,
         }
+        self._renderers = {}
+        # Last content_hash() each renderer was repainted for
+        self._last_content = {}
         
         # Connect state changes
         self.state_machine.add_listener(self._on_state_changed)
         
+        # Frames are driven by a single-shot timer that only runs while the
+        # visible phase or a fade needs further frames (see _schedule_frame)
+        self._frame_clock = QElapsedTimer()
+        self._frame_clock.start()
+        self._frame_timer = QTimer(self)
+        self._frame_timer.setSingleShot(True)
+        self._frame_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._frame_timer.timeout.connect(self._on_update)
+        
+        # Primary screen geometry, refreshed only when the screen changes
+        self._cached_screen_geo = None
+        self._watched_screen = None
+        self._watch_primary_screen()
+        QApplication.instance().primaryScreenChanged.connect(self._invalidate_screen_cache)
+        
         # Setup window
         self._setup_window()
         
-        # Update timer (~60fps)
-        self.update_timer = QTimer(self)
-        self.update_timer.timeout.connect(self._on_update)
-        self.update_timer.start(16)
-        
         # Action toast auto-hide timer
         self.action_timer = QTimer(self)
         self.action_timer.setSingleShot(True)
         self.action_timer.timeout.connect(self._hide_action)
     
+    def _get_renderer(self, state: OverlayState):
+        """Return the renderer for a state, creating it on first access."""
+        renderer = self._renderers.get(state)
+        if renderer is None:
+            renderer = self._renderer_factories[state](self.config, self.state_machine)
+            self._renderers[state] = renderer
+        return renderer
+    
     def _setup_window(self):
         """Configure window properties."""
         # Frameless, transparent, always-on-top
@@ -67,20 +143,50 @@ class OverlayWindow(QWidget):
             # Qt.WindowType.WindowTransparentForInput (Initially set, but we manage it dynamically now)
         )
         self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, True)
+        self._flag_input_passthrough = False
         
-        # Transparent background
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
         self.setAttribute(Qt.WidgetAttribute.WA_ShowWithoutActivating)
         
+        # Canvas: OpenGL if a context can be created, raster otherwise
+        surface_format = _surface_format()
+        if _opengl_available(surface_format):
+            self._canvas = _GLCanvas(self, surface_format)
+        else:
+            print("OpenGL unavailable, falling back to raster painting")
+            self._canvas = _RasterCanvas(self)
+        
         # Set size and position
         self._update_geometry()
     
+    def _screen_geometry(self) -> Optional[QRect]:
+        """Return the (cached) primary screen geometry."""
+        if self._cached_screen_geo is None:
+            screen = QApplication.primaryScreen()
+            if screen:
+                self._cached_screen_geo = screen.geometry()
+        return self._cached_screen_geo
+    
+    def _watch_primary_screen(self):
+        """Invalidate the cached geometry when the primary screen resizes."""
+        screen = QApplication.primaryScreen()
+        if screen is not None and screen is not self._watched_screen:
+            screen.geometryChanged.connect(self._invalidate_screen_cache)
+            self._watched_screen = screen
+    
+    def _invalidate_screen_cache(self, *args):
+        """Drop the cached screen geometry and re-layout for the new screen."""
+        self._cached_screen_geo = None
+        self._watch_primary_screen()
+        if self.state_machine.state == OverlayState.KEYPAD:
+            self._expand_for_keypad()
+        else:
+            self._update_geometry()
+    
     def _update_geometry(self):
         """Update window size and position."""
-        screen = QApplication.primaryScreen()
-        if screen:
-            screen_geo = screen.geometry()
-            
+        screen_geo = self._screen_geometry()
+        if screen_geo is not None:
             # Window size
             size = self.config.indicator_size * 4  # Extra space for animations
             self.setFixedSize(size, size)
@@ -97,6 +203,9 @@ class OverlayWindow(QWidget):
         # Emit signal
         self.state_changed.emit(old_state, new_state)
         
+        # New phase, full repaint
+        self._canvas.update()
+        
         # Check accessibility mode
         if self.config.accessibility_mode == AccessibilityMode.AUDIO_ONLY:
             return
@@ -128,12 +237,14 @@ class OverlayWindow(QWidget):
             
         # Update interactive state
         self._update_input_passthrough()
+        
+        # Restart the frame loop in case the previous phase let it stop
+        self._schedule_frame()
     
     def _expand_for_keypad(self):
         """Expand window to fit keypad (Full Keyboard)."""
-        screen = QApplication.primaryScreen()
-        if screen:
-            screen_geo = screen.geometry()
+        screen_geo = self._screen_geometry()
+        if screen_geo is not None:
             # Wider landscape size for full keyboard
             width = 1000
             height = 400 
@@ -158,18 +269,17 @@ class OverlayWindow(QWidget):
         """Update window transparency for input based on state."""
         is_keypad = self.state_machine.state == OverlayState.KEYPAD
         
-        # We need to toggle the WA_TransparentForMouseEvents attribute
-        # and potentially re-show the window for flags to take effect?
-        # Actually, WA_TransparentForMouseEvents is cleaner than WindowTransparentForInput flag toggling on some platforms
-        
+        # WA_TransparentForMouseEvents is cheap to set and needs no re-show
         self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, not is_keypad)
         
-        # Ensure we don't steal focus but can receive clicks
-        if is_keypad:
-            self.setWindowFlag(Qt.WindowType.WindowTransparentForInput, False)
-        else:
-            self.setWindowFlag(Qt.WindowType.WindowTransparentForInput, True)
-            
+        # Ensure we don't steal focus but can receive clicks.
+        # Changing window flags re-creates the native window, so only do it
+        # (and re-show) when entering or leaving the keypad.
+        passthrough = not is_keypad
+        if passthrough == self._flag_input_passthrough:
+            return
+        self._flag_input_passthrough = passthrough
+        self.setWindowFlag(Qt.WindowType.WindowTransparentForInput, passthrough)
         self.show() # Refresh flags
 
     def mousePressEvent(self, event):
@@ -178,14 +288,14 @@ class OverlayWindow(QWidget):
             super().mousePressEvent(event)
             return
 
-        renderer = self.renderers.get(OverlayState.KEYPAD)
+        renderer = self._get_renderer(OverlayState.KEYPAD)
         if renderer and hasattr(renderer, 'hit_test'):
             key = renderer.hit_test(event.position())
             if key:
                 self.state_machine.update_keypad(key)
                 # Visual feedback
-                self.update()
-                QTimer.singleShot(150, lambda: self.state_machine.update_keypad(None))
+                self._canvas.update()
+                QTimer.singleShot(150, lambda: self.update_keypad(None))
                 
                 # Handle key logic signal/callback? 
                 # Ideally we emit a signal here that Main can listen to logic
@@ -196,40 +306,74 @@ class OverlayWindow(QWidget):
     # Define signal
     key_pressed = Signal(str)
     
+    def _schedule_frame(self):
+        """Schedule the next animation frame, unless one is already pending."""
+        if not self._frame_timer.isActive():
+            self._frame_timer.start(self.FRAME_INTERVAL_MS)
+    
+    def showEvent(self, event):
+        """Start the frame loop once the window exists."""
+        super().showEvent(event)
+        self._schedule_frame()
+    
     def _on_update(self):
-        """Update animation and repaint."""
-        # Update current opacity from animation
-        self._current_opacity = self.animation.opacity
+        """Update animation and repaint what changed."""
+        # Real time since the last frame (capped after idle periods)
+        delta_ms = min(self._frame_clock.restart(), 100)
+        
+        if self.config.accessibility_mode == AccessibilityMode.AUDIO_ONLY:
+            return
+        
+        # Update animations of the renderer that is actually drawn
+        if self.config.accessibility_mode == AccessibilityMode.MINIMAL:
+            current_renderer = self._get_renderer(OverlayState.IDLE)
+        else:
+            current_renderer = self._get_renderer(self.state_machine.state)
+        current_renderer.tick(delta_ms)
         
-        # Update renderer-specific animations
-        current_renderer = self.renderers.get(self.state_machine.state)
-        if hasattr(current_renderer, 'update'):
-            current_renderer.update(16)
+        # Fades are applied as window opacity, so only repaint when the
+        # inputs of the visible phase changed
+        content = current_renderer.content_hash()
+        if content is None or content != self._last_content.get(current_renderer):
+            self._last_content[current_renderer] = content
+            self._canvas.update()
         
-        self.update()
+        if current_renderer.animated or self.animation.is_running():
+            # Animated phases and running fades need further frames
+            self._schedule_frame()
     
-    def paintEvent(self, event):
-        """Render the overlay."""
+    def resizeEvent(self, event):
+        """Keep the canvas covering the whole window."""
+        super().resizeEvent(event)
+        self._canvas.resize(event.size())
+    
+    def _paint(self, painter: QPainter):
+        """Render the overlay onto the canvas."""
+        rect = QRectF(0, 0, self.width(), self.height())
+        
+        # The GL framebuffer keeps the previous frame, start from transparent
+        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_Source)
+        painter.fillRect(rect, Qt.GlobalColor.transparent)
+        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceOver)
+        
         if self.config.accessibility_mode == AccessibilityMode.AUDIO_ONLY:
             return
         
-        painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         
-        rect = QRectF(0, 0, self.width(), self.height())
+        # Overall opacity is applied by the compositor via windowOpacity
+        opacity = 1.0
         
         # Get current renderer
         current_state = self.state_machine.state
-        renderer = self.renderers.get(current_state)
+        renderer = self._get_renderer(current_state)
         
         # Render minimal mode
         if self.config.accessibility_mode == AccessibilityMode.MINIMAL:
             # Only render idle dot
-            self.renderers[OverlayState.IDLE].render(painter, rect, self._current_opacity)
+            self._get_renderer(OverlayState.IDLE).render(painter, rect, opacity)
         elif renderer:
-            renderer.render(painter, rect, self._current_opacity)
-        
-        painter.end()
+            renderer.render(painter, rect, opacity)
     
     # Public API
     def set_position(self, position):
@@ -240,11 +384,12 @@ class OverlayWindow(QWidget):
     def set_accessibility_mode(self, mode: AccessibilityMode):
         """Change accessibility mode."""
         self.config.accessibility_mode = mode
-        self.update()
+        self._canvas.update()
     
     def show_action(self, message: str, icon: Optional[str] = None):
         """Show action feedback toast."""
         self.state_machine.set_action(message, icon)
+        self._canvas.update()
     
     def start_listening(self):
         """Enter listening mode."""
@@ -261,14 +406,23 @@ class OverlayWindow(QWidget):
     def show_gesture(self, hover_key: Optional[str] = None):
         """Show gesture overlay."""
         self.state_machine.set_gesture(hover_key=hover_key)
+        self._canvas.update()
+    
+    def update_gesture(self, landmarks: Optional[list] = None, active_finger: Optional[int] = None,
+                       hover_key: Optional[str] = None):
+        """Update gesture data (e.g. per camera frame) and repaint."""
+        self.state_machine.update_gesture(landmarks, active_finger, hover_key)
+        self._canvas.update()
     
     def show_keypad(self, active_key: Optional[str] = None):
         """Show keypad overlay."""
         self.state_machine.set_keypad(active_key)
+        self._canvas.update()
     
     def update_keypad(self, active_key: Optional[str]):
         """Update active keypad key."""
         self.state_machine.update_keypad(active_key)
+        self._canvas.update()
     
     def return_to_idle(self):
         """Return to idle state."""
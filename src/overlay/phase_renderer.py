@@ -1,25 +1,54 @@
 """Phase renderers for the overlay interface."""
 
+import bisect
 import math
 from typing import Optional
 from PySide6.QtCore import Qt, QRectF, QPointF, QTimer
 from PySide6.QtGui import (
-    QPainter, QPen, QBrush, QColor, QRadialGradient,
-    QLinearGradient, QFont, QPainterPath
+    QPainter, QPen, QBrush, QColor, QGradient, QRadialGradient,
+    QLinearGradient, QFont, QPainterPath, QPixmap
 )
 from PySide6.QtWidgets import QWidget
 
 from .state_machine import OverlayState, OverlayStateMachine
 from .config import OverlayConfig
-from .animations import BreathingAnimation, WaveformAnimation, interpolate_color
+from .animations import BreathingAnimation, WaveformAnimation
+
+
+# Shared base color for text, copied before alpha is applied
+_WHITE = QColor(255, 255, 255)
 
 
 class BaseRenderer:
     """Base class for phase renderers."""
     
+    # Whether the phase changes every frame without external input
+    animated = False
+    
+    # Base size as a fraction of the smaller widget dimension
+    BASE_SIZE_FACTOR = 0.35
+    
     def __init__(self, config: OverlayConfig, state_machine: OverlayStateMachine):
         self.config = config
         self.state_machine = state_machine
+        self._last_size = (-1.0, -1.0)
+        self._base_size = 0.0
+    
+    def base_size(self, rect: QRectF) -> float:
+        """Return the phase's base size for rect, recomputed only on resize."""
+        size = (rect.width(), rect.height())
+        if size != self._last_size:
+            self._last_size = size
+            self._base_size = min(size) * self.BASE_SIZE_FACTOR
+        return self._base_size
+    
+    def content_hash(self):
+        """Return the inputs of the next render, or None if always changing."""
+        return None
+    
+    def tick(self, delta_ms: int):
+        """Advance animation state by delta_ms. render() only reads the result."""
+        pass
     
     def render(self, painter: QPainter, rect: QRectF, opacity: float):
         """Render the phase. Override in subclasses."""
@@ -29,6 +58,9 @@ class BaseRenderer:
 class IdleRenderer(BaseRenderer):
     """Renders the idle phase - breathing dot."""
     
+    animated = True
+    BASE_SIZE_FACTOR = 0.3
+    
     def __init__(self, config: OverlayConfig, state_machine: OverlayStateMachine):
         super().__init__(config, state_machine)
         self.breathing = BreathingAnimation(
@@ -36,74 +68,110 @@ class IdleRenderer(BaseRenderer):
             max_value=0.12,
             duration_ms=config.breathing_duration_ms
         )
-        self._elapsed = 0
+        self._breathing_value = self.breathing.update(0)
+        
+        self._inner_color = QColor(config.colors.primary_glow_q)
+        self._inner_brush = QBrush(self._inner_color)
+        
+        # Glow gradient in object coordinates, so it fits whatever ellipse
+        # is drawn; only its alpha changes with the breathing value
+        self._glow_gradient = QRadialGradient(0.5, 0.5, 0.5)
+        self._glow_gradient.setCoordinateMode(QGradient.CoordinateMode.ObjectMode)
+        self._glow_color = QColor(config.colors.primary_glow_q)
+        self._glow_brushes = {}  # alpha -> QBrush, at most one per breathing step
+    
+    def _glow_brush(self, alpha: float) -> QBrush:
+        """Return the (cached) glow brush for a center alpha."""
+        brush = self._glow_brushes.get(alpha)
+        if brush is None:
+            self._glow_color.setAlphaF(alpha)
+            self._glow_gradient.setColorAt(0, self._glow_color)
+            self._glow_color.setAlphaF(0)
+            self._glow_gradient.setColorAt(1, self._glow_color)
+            brush = QBrush(self._glow_gradient)
+            self._glow_brushes[alpha] = brush
+        return brush
     
-    def update(self, delta_ms: int):
+    def tick(self, delta_ms: int):
         """Update breathing animation."""
-        self._elapsed += delta_ms
+        self._breathing_value = self.breathing.update(delta_ms)
+    
+    def content_hash(self):
+        """The glow only changes when the breathing table step does."""
+        return self._breathing_value
     
     def render(self, painter: QPainter, rect: QRectF, opacity: float):
         """Render breathing dot."""
         center = rect.center()
         
         # Calculate breathing size
-        breathing_value = self.breathing.update(16)  # ~60fps
-        base_size = min(rect.width(), rect.height()) * 0.3
+        breathing_value = self._breathing_value
+        base_size = self.base_size(rect)
         size = base_size * (0.8 + breathing_value * 2)
         
-        # Create radial gradient for glow effect
-        gradient = QRadialGradient(center, size)
-        color = QColor(self.config.colors.primary_glow)
-        color.setAlphaF(opacity * breathing_value * 8)
-        gradient.setColorAt(0, color)
-        color.setAlphaF(0)
-        gradient.setColorAt(1, color)
-        
+        # Radial gradient for glow effect
         painter.setPen(Qt.PenStyle.NoPen)
-        painter.setBrush(QBrush(gradient))
+        painter.setBrush(self._glow_brush(min(1.0, opacity * breathing_value * 8)))
         painter.drawEllipse(center, size, size)
         
         # Inner dot
         inner_size = base_size * 0.15
-        inner_color = QColor(self.config.colors.primary_glow)
-        inner_color.setAlphaF(opacity * 0.6)
-        painter.setBrush(QBrush(inner_color))
+        self._inner_color.setAlphaF(opacity * 0.6)
+        self._inner_brush.setColor(self._inner_color)
+        painter.setBrush(self._inner_brush)
         painter.drawEllipse(center, inner_size, inner_size)
 
 
 class ListeningRenderer(BaseRenderer):
     """Renders the listening phase - waveform with mic icon."""
     
+    animated = True
+    
+    BAR_WIDTH = 6
+    BAR_SPACING = 10
+    
     def __init__(self, config: OverlayConfig, state_machine: OverlayStateMachine):
         super().__init__(config, state_machine)
         self.waveform = WaveformAnimation(num_bars=5)
+        self._current_heights = [0.1] * self.waveform.num_bars
+        
+        self._ring_color = QColor(config.colors.listening_q)
+        self._ring_pen = QPen(self._ring_color, 3)
+        self._bar_color = QColor(config.colors.listening_q)
+        self._bar_brush = QBrush(self._bar_color)
+        self._text_color = QColor(_WHITE)
+        self._text_pen = QPen(self._text_color)
+        self._text_font = QFont("Segoe UI", 10)
+    
+    def tick(self, delta_ms: int):
+        """Update waveform bar heights from the current audio level."""
+        audio_level = self.state_machine.audio_level
+        self._current_heights = self.waveform.update(delta_ms, max(0.3, audio_level))
     
     def render(self, painter: QPainter, rect: QRectF, opacity: float):
         """Render listening waveform."""
         center = rect.center()
-        base_size = min(rect.width(), rect.height()) * 0.35
+        base_size = self.base_size(rect)
         
         # Outer glow ring
-        ring_color = QColor(self.config.colors.listening)
-        ring_color.setAlphaF(opacity * 0.3)
-        pen = QPen(ring_color, 3)
-        painter.setPen(pen)
+        self._ring_color.setAlphaF(opacity * 0.3)
+        self._ring_pen.setColor(self._ring_color)
+        painter.setPen(self._ring_pen)
         painter.setBrush(Qt.BrushStyle.NoBrush)
         painter.drawEllipse(center, base_size, base_size)
         
         # Waveform bars
-        audio_level = self.state_machine.audio_level
-        heights = self.waveform.update(16, max(0.3, audio_level))
+        heights = self._current_heights
         
-        bar_width = 6
-        bar_spacing = 10
+        bar_width = self.BAR_WIDTH
+        bar_spacing = self.BAR_SPACING
         total_width = len(heights) * bar_spacing
         start_x = center.x() - total_width / 2
         
-        bar_color = QColor(self.config.colors.listening)
-        bar_color.setAlphaF(opacity * 0.8)
+        self._bar_color.setAlphaF(opacity * 0.8)
+        self._bar_brush.setColor(self._bar_color)
         painter.setPen(Qt.PenStyle.NoPen)
-        painter.setBrush(QBrush(bar_color))
+        painter.setBrush(self._bar_brush)
         
         max_height = base_size * 0.6
         for i, height in enumerate(heights):
@@ -116,11 +184,10 @@ class ListeningRenderer(BaseRenderer):
             )
         
         # "Listening..." text
-        font = QFont("Segoe UI", 10)
-        painter.setFont(font)
-        text_color = QColor("#FFFFFF")
-        text_color.setAlphaF(opacity * 0.7)
-        painter.setPen(text_color)
+        painter.setFont(self._text_font)
+        self._text_color.setAlphaF(opacity * 0.7)
+        self._text_pen.setColor(self._text_color)
+        painter.setPen(self._text_pen)
         text_rect = QRectF(rect.x(), center.y() + base_size + 10, rect.width(), 20)
         painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, "Listening...")
 
@@ -128,25 +195,47 @@ class ListeningRenderer(BaseRenderer):
 class ProcessingRenderer(BaseRenderer):
     """Renders the processing phase - rotating ring with color shift."""
     
+    animated = True
+    
     def __init__(self, config: OverlayConfig, state_machine: OverlayStateMachine):
         super().__init__(config, state_machine)
         self._rotation = 0
         self._color_phase = 0
+        self._color_lut = config.colors.build_lut("listening", "processing")
+        
+        self._arc_pen = QPen(QColor(), 4, Qt.PenStyle.SolidLine, Qt.PenCapStyle.RoundCap)
+        # All arc segments in one path around the origin, rebuilt on resize
+        self._arc_path = QPainterPath()
+        self._arc_path_size = None
+        self._text_color = QColor(_WHITE)
+        self._text_pen = QPen(self._text_color)
+        self._text_font = QFont("Segoe UI", 10)
     
-    def update(self, delta_ms: int):
+    def tick(self, delta_ms: int):
         """Update rotation and color."""
         self._rotation = (self._rotation + delta_ms * 0.1) % 360
         self._color_phase = (self._color_phase + delta_ms * 0.001) % 1.0
     
+    def _arc_segments(self, base_size: float) -> QPainterPath:
+        """Return the four ring arcs as one path for the given radius."""
+        if base_size != self._arc_path_size:
+            arc_rect = QRectF(-base_size, -base_size, base_size * 2, base_size * 2)
+            path = QPainterPath()
+            for i in range(4):
+                start_angle = i * 90 + 20
+                path.arcMoveTo(arc_rect, start_angle)
+                path.arcTo(arc_rect, start_angle, 50)
+            self._arc_path = path
+            self._arc_path_size = base_size
+        return self._arc_path
+    
     def render(self, painter: QPainter, rect: QRectF, opacity: float):
         """Render rotating processing ring."""
         center = rect.center()
-        base_size = min(rect.width(), rect.height()) * 0.35
+        base_size = self.base_size(rect)
         
         # Color transition blue -> purple
-        color1 = QColor(self.config.colors.listening)
-        color2 = QColor(self.config.colors.processing)
-        current_color = interpolate_color(color1, color2, self._color_phase)
+        current_color = QColor.fromRgba(int(self._color_lut[int(self._color_phase * 255)]))
         current_color.setAlphaF(opacity * 0.6)
         
         painter.save()
@@ -154,26 +243,20 @@ class ProcessingRenderer(BaseRenderer):
         painter.rotate(self._rotation)
         
         # Draw arc segments
-        pen = QPen(current_color, 4, Qt.PenStyle.SolidLine, Qt.PenCapStyle.RoundCap)
-        painter.setPen(pen)
+        self._arc_pen.setColor(current_color)
+        painter.setPen(self._arc_pen)
         painter.setBrush(Qt.BrushStyle.NoBrush)
         
-        arc_rect = QRectF(-base_size, -base_size, base_size * 2, base_size * 2)
-        
         # Draw multiple arcs for visual effect
-        for i in range(4):
-            start_angle = i * 90 * 16 + 20 * 16
-            span_angle = 50 * 16
-            painter.drawArc(arc_rect, start_angle, span_angle)
+        painter.drawPath(self._arc_segments(base_size))
         
         painter.restore()
         
         # "Understanding..." text
-        font = QFont("Segoe UI", 10)
-        painter.setFont(font)
-        text_color = QColor("#FFFFFF")
-        text_color.setAlphaF(opacity * 0.7)
-        painter.setPen(text_color)
+        painter.setFont(self._text_font)
+        self._text_color.setAlphaF(opacity * 0.7)
+        self._text_pen.setColor(self._text_color)
+        painter.setPen(self._text_pen)
         text_rect = QRectF(rect.x(), center.y() + base_size + 10, rect.width(), 20)
         painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, "Understanding...")
 
@@ -181,6 +264,19 @@ class ProcessingRenderer(BaseRenderer):
 class ActionRenderer(BaseRenderer):
     """Renders the action phase - glass toast notification."""
     
+    def __init__(self, config: OverlayConfig, state_machine: OverlayStateMachine):
+        super().__init__(config, state_machine)
+        self._bg_color = QColor(255, 255, 255)
+        self._bg_brush = QBrush(self._bg_color)
+        self._border_color = QColor(255, 255, 255)
+        self._border_pen = QPen(self._border_color, 1)
+        self._text_color = QColor(config.colors.action_text_q)
+        self._text_pen = QPen(self._text_color)
+        self._text_font = QFont("Segoe UI", 11)
+    
+    def content_hash(self):
+        return self.state_machine.action_data.message
+    
     def render(self, painter: QPainter, rect: QRectF, opacity: float):
         """Render action toast."""
         message = self.state_machine.action_data.message
@@ -196,30 +292,41 @@ class ActionRenderer(BaseRenderer):
         toast_rect = QRectF(toast_x, toast_y, toast_width, toast_height)
         
         # Glass background
-        bg_color = QColor(255, 255, 255, int(40 * opacity))
+        self._bg_color.setAlpha(int(40 * opacity))
+        self._bg_brush.setColor(self._bg_color)
         painter.setPen(Qt.PenStyle.NoPen)
-        painter.setBrush(QBrush(bg_color))
+        painter.setBrush(self._bg_brush)
         painter.drawRoundedRect(toast_rect, 12, 12)
         
         # Border glow
-        border_color = QColor(255, 255, 255, int(60 * opacity))
-        pen = QPen(border_color, 1)
-        painter.setPen(pen)
+        self._border_color.setAlpha(int(60 * opacity))
+        self._border_pen.setColor(self._border_color)
+        painter.setPen(self._border_pen)
         painter.setBrush(Qt.BrushStyle.NoBrush)
         painter.drawRoundedRect(toast_rect, 12, 12)
         
         # Text
-        font = QFont("Segoe UI", 11)
-        painter.setFont(font)
-        text_color = QColor(self.config.colors.action_text)
-        text_color.setAlphaF(opacity * 0.95)
-        painter.setPen(text_color)
+        painter.setFont(self._text_font)
+        self._text_color.setAlphaF(opacity * 0.95)
+        self._text_pen.setColor(self._text_color)
+        painter.setPen(self._text_pen)
         painter.drawText(toast_rect, Qt.AlignmentFlag.AlignCenter, message)
 
 
 class GestureRenderer(BaseRenderer):
     """Renders the gesture phase - hand outline with highlights."""
     
+    def __init__(self, config: OverlayConfig, state_machine: OverlayStateMachine):
+        super().__init__(config, state_machine)
+        self._bg_color = QColor(255, 255, 255)
+        self._bg_brush = QBrush(self._bg_color)
+        self._text_color = QColor(config.colors.gesture_highlight_q)
+        self._text_pen = QPen(self._text_color)
+        self._text_font = QFont("Segoe UI", 16, QFont.Weight.Bold)
+    
+    def content_hash(self):
+        return self.state_machine.gesture_data.hover_key
+    
     def render(self, painter: QPainter, rect: QRectF, opacity: float):
         """Render gesture overlay."""
         gesture_data = self.state_machine.gesture_data
@@ -239,43 +346,91 @@ class GestureRenderer(BaseRenderer):
             )
             
             # Glass background
-            bg_color = QColor(255, 255, 255, int(50 * opacity))
+            self._bg_color.setAlpha(int(50 * opacity))
+            self._bg_brush.setColor(self._bg_color)
             painter.setPen(Qt.PenStyle.NoPen)
-            painter.setBrush(QBrush(bg_color))
+            painter.setBrush(self._bg_brush)
             painter.drawRoundedRect(label_rect, 8, 8)
             
             # Key text
-            font = QFont("Segoe UI", 16, QFont.Weight.Bold)
-            painter.setFont(font)
-            text_color = QColor(self.config.colors.gesture_highlight)
-            text_color.setAlphaF(opacity * 0.9)
-            painter.setPen(text_color)
+            painter.setFont(self._text_font)
+            self._text_color.setAlphaF(opacity * 0.9)
+            self._text_pen.setColor(self._text_color)
+            painter.setPen(self._text_pen)
             painter.drawText(label_rect, Qt.AlignmentFlag.AlignCenter, gesture_data.hover_key)
 
 
 class KeypadRenderer(BaseRenderer):
     """Renders the keypad phase - QWERTY Keyboard."""
     
+    BASE_KEY_SIZE = 50
+    GAP = 6
+    
     def __init__(self, config: OverlayConfig, state_machine: OverlayStateMachine):
         super().__init__(config, state_machine)
-        self._key_rects = {}  # Store key rects for hit testing
-
-    def render(self, painter: QPainter, rect: QRectF, opacity: float):
-        """Render keyboard grid."""
-        keypad_data = self.state_machine.keypad_data
-        # Ensure layout is initialized
-        if not keypad_data.rows or len(keypad_data.rows) < 2:
-            keypad_data._init_layout()
-            
-        rows = keypad_data.rows
-        active_key = keypad_data.active_key
+        # Hit testing: per row (y_top, y_bottom, key left edges, key right edges, codes)
+        self._row_bounds = []
+        # Cached layout: ([(KeyData, QRectF)], caption QRectF) and what it was built for
+        self._layout_cache = None
+        self._layout_key = None
+        self._keys_by_code = {}  # code -> [(KeyData, QRectF)], e.g. both Shift keys
+        # All key shapes batched per style, built with the layout
+        self._normal_path = QPainterPath()
+        self._action_path = QPainterPath()
+        self._border_path = QPainterPath()
+        # Pre-rendered inactive keyboard and what it was rendered for
+        self._bg_pixmap: Optional[QPixmap] = None
+        self._bg_key = None
+        
+        self._key_font = QFont("Segoe UI", 14, QFont.Weight.Medium)
+        self._caption_font = QFont("Segoe UI", 9)
+        
+        # Key styles, alpha applied per opacity in _apply_opacity
+        self._active_color = QColor(config.colors.gesture_highlight_q)
+        self._action_color = QColor(config.colors.processing_q)
+        self._normal_color = QColor(255, 255, 255)
+        self._border_color = QColor(255, 255, 255)
+        self._text_color = QColor(_WHITE)
+        self._caption_color = QColor(_WHITE)
+        self._active_brush = QBrush(self._active_color)
+        self._action_brush = QBrush(self._action_color)
+        self._normal_brush = QBrush(self._normal_color)
+        self._border_pen = QPen(self._border_color, 1)
+        self._text_pen = QPen(self._text_color)
+        self._caption_pen = QPen(self._caption_color)
+        self._styled_opacity = None
+    
+    def _apply_opacity(self, opacity: float):
+        """Update the cached key colors, brushes and pens for an opacity."""
+        if opacity == self._styled_opacity:
+            return
+        self._active_color.setAlphaF(opacity * 0.6)
+        self._action_color.setAlphaF(opacity * 0.25)
+        self._normal_color.setAlpha(int(35 * opacity))
+        self._border_color.setAlpha(int(50 * opacity))
+        self._text_color.setAlphaF(opacity * 0.95)
+        self._caption_color.setAlphaF(opacity * 0.5)
+        self._active_brush.setColor(self._active_color)
+        self._action_brush.setColor(self._action_color)
+        self._normal_brush.setColor(self._normal_color)
+        self._border_pen.setColor(self._border_color)
+        self._text_pen.setColor(self._text_color)
+        self._caption_pen.setColor(self._caption_color)
+        self._styled_opacity = opacity
+    
+    def content_hash(self):
+        return self.state_machine.keypad_data.active_key
+    
+    def _layout(self, rect: QRectF, rows):
+        """Return key rects and caption rect, recomputed only when rows or rect change."""
+        layout_key = (id(rows), len(rows), rect.x(), rect.y(), rect.width(), rect.height())
+        if layout_key == self._layout_key:
+            return self._layout_cache
         
-        base_key_size = 50 
-        gap = 6
+        base_key_size = self.BASE_KEY_SIZE
+        gap = self.GAP
         
         # Calculate total dimensions to center the keyboard
-        # Assuming max width approx 15 units * base_size
-        max_row_width = 0
         total_height = len(rows) * (base_key_size + gap) - gap
         
         # Pre-calculate row widths to center each row
@@ -283,73 +438,139 @@ class KeypadRenderer(BaseRenderer):
         for row in rows:
             w = sum(key.width * base_key_size for key in row) + (len(row) - 1) * gap
             row_widths.append(w)
-            max_row_width = max(max_row_width, w)
             
-        start_y = rect.center().y() - total_height / 2
-        
-        font = QFont("Segoe UI", 14, QFont.Weight.Medium)
-        painter.setFont(font)
-        
-        self._key_rects.clear()
-
-        current_y = start_y
+        center = rect.center()
+        current_y = center.y() - total_height / 2
         
+        keys = []
+        self._row_bounds = []
+        self._keys_by_code = {}
+        normal_path = QPainterPath()
+        action_path = QPainterPath()
+        border_path = QPainterPath()
         for r_idx, row in enumerate(rows):
-            current_x = rect.center().x() - row_widths[r_idx] / 2
+            current_x = center.x() - row_widths[r_idx] / 2
+            lefts, rights, codes = [], [], []
+            # Key edges are snapped to whole pixels once here, so the shared
+            # rects, paths and hit-test bounds are all pixel-aligned
+            top = round(current_y)
             
             for key_data in row:
                 width = key_data.width * base_key_size
-                height = base_key_size
-                
-                key_rect = QRectF(current_x, current_y, width, height)
-                self._key_rects[key_data.code] = key_rect  # Key by code, not label
-                
-                # Active highlight
-                is_active = key_data.code == active_key
-                
-                # Styling
-                if is_active:
-                    bg_color = QColor(self.config.colors.gesture_highlight)
-                    bg_color.setAlphaF(opacity * 0.6)
-                elif key_data.is_action:
-                     bg_color = QColor(self.config.colors.processing)
-                     bg_color.setAlphaF(opacity * 0.25)
-                else:
-                    bg_color = QColor(255, 255, 255, int(35 * opacity))
-                
-                painter.setPen(Qt.PenStyle.NoPen)
-                painter.setBrush(QBrush(bg_color))
-                painter.drawRoundedRect(key_rect, 6, 6)
-                
-                # Border
-                border_color = QColor(255, 255, 255, int(50 * opacity))
-                painter.setPen(QPen(border_color, 1))
-                painter.setBrush(Qt.BrushStyle.NoBrush)
-                painter.drawRoundedRect(key_rect, 6, 6)
-                
-                # Label
-                text_color = QColor("#FFFFFF")
-                text_color.setAlphaF(opacity * 0.95)
-                painter.setPen(text_color)
-                painter.drawText(key_rect, Qt.AlignmentFlag.AlignCenter, key_data.label)
-                
+                left = round(current_x)
+                right = round(current_x + width)
+                key_rect = QRectF(left, top, right - left, base_key_size)
+                keys.append((key_data, key_rect))
+                self._keys_by_code.setdefault(key_data.code, []).append((key_data, key_rect))
+                fill_path = action_path if key_data.is_action else normal_path
+                fill_path.addRoundedRect(key_rect, 6, 6)
+                border_path.addRoundedRect(key_rect, 6, 6)
+                lefts.append(left)
+                rights.append(right)
+                codes.append(key_data.code)  # Key by code, not label
                 current_x += width + gap
             
+            self._row_bounds.append((top, top + base_key_size, lefts, rights, codes))
             current_y += base_key_size + gap
         
+        caption_rect = QRectF(rect.x(), current_y + 10, rect.width(), 20)
+        self._normal_path = normal_path
+        self._action_path = action_path
+        self._border_path = border_path
+        
+        self._layout_cache = (keys, caption_rect)
+        self._layout_key = layout_key
+        return self._layout_cache
+
+    def render(self, painter: QPainter, rect: QRectF, opacity: float):
+        """Render keyboard grid."""
+        keypad_data = self.state_machine.keypad_data
+        # Ensure layout is initialized
+        if not keypad_data.rows or len(keypad_data.rows) < 2:
+            keypad_data._init_layout()
+            
+        active_key = keypad_data.active_key
+        keys, caption_rect = self._layout(rect, keypad_data.rows)
+        self._apply_opacity(opacity)
+        
+        # Static keyboard is blitted from a cached pixmap
+        dpr = painter.device().devicePixelRatioF()
+        bg_key = (self._layout_key, opacity, dpr)
+        if bg_key != self._bg_key:
+            self._bg_pixmap = self._render_background(rect, keys, caption_rect, opacity, dpr)
+            self._bg_key = bg_key
+        painter.drawPixmap(rect.topLeft(), self._bg_pixmap)
+        
+        # Only the active key is painted per frame
+        if active_key is not None:
+            painter.setFont(self._key_font)
+            for key_data, key_rect in self._keys_by_code.get(active_key, ()):
+                self._draw_key(painter, key_data, key_rect, opacity, True)
+    
+    def _render_background(self, rect: QRectF, keys, caption_rect: QRectF,
+                           opacity: float, dpr: float) -> QPixmap:
+        """Paint all keys in their inactive state plus the caption into a pixmap."""
+        pixmap = QPixmap((rect.size() * dpr).toSize())
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.translate(-rect.topLeft())
+        
+        # Key backgrounds and borders, one path per style
+        painter.fillPath(self._normal_path, self._normal_brush)
+        painter.fillPath(self._action_path, self._action_brush)
+        painter.strokePath(self._border_path, self._border_pen)
+        
+        # Labels
+        painter.setFont(self._key_font)
+        painter.setPen(self._text_pen)
+        for key_data, key_rect in keys:
+            painter.drawText(key_rect, Qt.AlignmentFlag.AlignCenter, key_data.label)
+        
         # Caption
-        caption_y = current_y + 10
-        caption_rect = QRectF(rect.x(), caption_y, rect.width(), 20)
-        caption_font = QFont("Segoe UI", 9)
-        painter.setFont(caption_font)
-        caption_color = QColor("#FFFFFF")
-        caption_color.setAlphaF(opacity * 0.5)
-        painter.setPen(caption_color)
+        painter.setFont(self._caption_font)
+        painter.setPen(self._caption_pen)
         painter.drawText(caption_rect, Qt.AlignmentFlag.AlignCenter, "Keyboard Mode (Close with 'X' command or ⌫ long press)")
+        
+        painter.end()
+        return pixmap
+    
+    def _draw_key(self, painter: QPainter, key_data, key_rect: QRectF, opacity: float, is_active: bool):
+        """Draw one key's background, border and label."""
+        # Styling
+        if is_active:
+            brush = self._active_brush
+            # Replace the cached inactive background instead of blending over it
+            painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_Source)
+        elif key_data.is_action:
+            brush = self._action_brush
+        else:
+            brush = self._normal_brush
+        
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(brush)
+        painter.drawRoundedRect(key_rect, 6, 6)
+        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceOver)
+        
+        # Border
+        painter.setPen(self._border_pen)
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.drawRoundedRect(key_rect, 6, 6)
+        
+        # Label
+        painter.setPen(self._text_pen)
+        painter.drawText(key_rect, Qt.AlignmentFlag.AlignCenter, key_data.label)
 
     def hit_test(self, pos: QPointF) -> Optional[str]:
         """Return the key code at the given position."""
-        for code, rect in self._key_rects.items():
-            if rect.contains(pos):
-                return code
+        x, y = pos.x(), pos.y()
+        for y_top, y_bottom, lefts, rights, codes in self._row_bounds:
+            if y_top <= y <= y_bottom:
+                # Rightmost key starting at or before x, unless x is in the gap after it
+                i = bisect.bisect_right(lefts, x) - 1
+                if i >= 0 and x <= rights[i]:
+                    return codes[i]
+                return None
         return None
@@ -1,7 +1,7 @@
 """State machine for overlay phases."""
 
 from enum import Enum, auto
-from typing import Callable, Optional, List
+from typing import Callable, Optional, List, Sequence, Tuple
 from dataclasses import dataclass, field
 
 
@@ -15,14 +15,14 @@ class OverlayState(Enum):
     KEYPAD = auto()
 
 
-@dataclass
+@dataclass(slots=True)
 class ActionData:
     """Data for action phase."""
     message: str = ""
     icon: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class GestureData:
     """Data for gesture phase."""
     hand_landmarks: List = field(default_factory=list)
@@ -30,7 +30,7 @@ class GestureData:
     hover_key: Optional[str] = None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class KeyData:
     """Data for a single key."""
     label: str
@@ -38,41 +38,38 @@ class KeyData:
     width: float = 1.0  # Width multiplier (1.0 = standard key)
     is_action: bool = False
 
-@dataclass
+
+# 5-row laptop layout, built once. KeyData is immutable, so every
+# KeypadData shares it.
+_DEFAULT_KEYPAD_ROWS = (
+    # Row 1
+    tuple(KeyData(c, c) for c in "`1234567890-=") + (KeyData("⌫", "backspace", 2.0, True),),
+    # Row 2
+    (KeyData("Tab", "tab", 1.5, True),) + tuple(KeyData(c, c) for c in "qwertyuiop[]\\"),
+    # Row 3
+    (KeyData("Caps", "capslock", 1.8, True),) + tuple(KeyData(c, c) for c in "asdfghjkl;'") + (KeyData("Enter", "enter", 2.2, True),),
+    # Row 4
+    (KeyData("Shift", "shift", 2.3, True),) + tuple(KeyData(c, c) for c in "zxcvbnm,./") + (KeyData("Shift", "shift", 2.3, True),),
+    # Row 5
+    (KeyData("Ctrl", "ctrl", 1.5, True), KeyData("Win", "win", 1.5, True), KeyData("Alt", "alt", 1.5, True),
+     KeyData("SPACE", "space", 6.0),
+     KeyData("Alt", "alt", 1.5, True), KeyData("Fn", "fn", 1.5, True), KeyData("Ctrl", "ctrl", 1.5, True)),
+)
+
+
+@dataclass(slots=True)
 class KeypadData:
     """Data for keypad phase."""
     active_key: Optional[str] = None
-    # 5-row laptop layout
-    rows: List[List[KeyData]] = field(default_factory=lambda: [
-        # Row 1: Numbers
-        [KeyData(k, k) for k in "`1234567890-="] + [KeyData("Back", "backspace", 2.0, True)],
-        # Row 2: QWERTY
-        [KeyData("Tab", "tab", 1.5, True)] + [KeyData(k, k) for k in "mwertyuiop[]\\"],
-        # Row 3: ASDF (Fixed 'm' typo in row 2 to 'q' below)
-        # Wait, 'mwertyuiop' -> 'qwertyuiop'
-        # Correcting Row 2 manually
-    ])
+    # Assign a new sequence to change the layout; the default is shared
+    rows: Sequence[Sequence[KeyData]] = field(default_factory=lambda: _DEFAULT_KEYPAD_ROWS)
 
     def __post_init__(self):
-        # Initialize full layout if rows is empty (default factory above is complex to write inline perfectly)
         if not self.rows:
             self._init_layout()
             
     def _init_layout(self):
-        self.rows = [
-            # Row 1
-            [KeyData(c, c) for c in "`1234567890-="] + [KeyData("⌫", "backspace", 2.0, True)],
-            # Row 2
-            [KeyData("Tab", "tab", 1.5, True)] + [KeyData(c, c) for c in "qwertyuiop[]\\"],
-            # Row 3
-            [KeyData("Caps", "capslock", 1.8, True)] + [KeyData(c, c) for c in "asdfghjkl;'"] + [KeyData("Enter", "enter", 2.2, True)],
-            # Row 4
-            [KeyData("Shift", "shift", 2.3, True)] + [KeyData(c, c) for c in "zxcvbnm,./"] + [KeyData("Shift", "shift", 2.3, True)],
-            # Row 5
-            [KeyData("Ctrl", "ctrl", 1.5, True), KeyData("Win", "win", 1.5, True), KeyData("Alt", "alt", 1.5, True), 
-             KeyData("SPACE", "space", 6.0), 
-             KeyData("Alt", "alt", 1.5, True), KeyData("Fn", "fn", 1.5, True), KeyData("Ctrl", "ctrl", 1.5, True)]
-        ]
+        self.rows = _DEFAULT_KEYPAD_ROWS
 
 
 class OverlayStateMachine:
@@ -82,6 +79,8 @@ class OverlayStateMachine:
         self._state = OverlayState.IDLE
         self._previous_state = OverlayState.IDLE
         self._listeners: List[Callable[[OverlayState, OverlayState], None]] = []
+        # Snapshot iterated on every transition; rebuilt only on add/remove
+        self._listeners_tuple: Tuple[Callable[[OverlayState, OverlayState], None], ...] = ()
         
         # Phase-specific data
         self.action_data = ActionData()
@@ -102,17 +101,24 @@ class OverlayStateMachine:
     def add_listener(self, callback: Callable[[OverlayState, OverlayState], None]):
         """Add state change listener. Callback receives (old_state, new_state)."""
         self._listeners.append(callback)
+        self._listeners_tuple = tuple(self._listeners)
     
     def remove_listener(self, callback: Callable):
         """Remove state change listener."""
         if callback in self._listeners:
             self._listeners.remove(callback)
+            self._listeners_tuple = tuple(self._listeners)
     
     def _notify_listeners(self, old_state: OverlayState, new_state: OverlayState):
         """Notify all listeners of state change."""
-        for listener in self._listeners:
+        listeners = iter(self._listeners_tuple)
+        # One handler around the whole loop; after a failure the iterator
+        # resumes with the next listener
+        while True:
             try:
-                listener(old_state, new_state)
+                for listener in listeners:
+                    listener(old_state, new_state)
+                return
             except Exception as e:
                 print(f"Error in state listener: {e}")
     
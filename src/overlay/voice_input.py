@@ -1,9 +1,44 @@
 import speech_recognition as sr
 import sounddevice as sd
 import numpy as np
+import math
 import threading
-import queue
-from PySide6.QtCore import QObject, Signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+from PySide6.QtCore import QObject, QTimer, Signal
+
+try:
+    from faster_whisper import WhisperModel
+except ImportError:  # Optional: fall back to Google Web Speech
+    WhisperModel = None
+
+try:
+    from numba import njit
+except ImportError:  # Optional: fall back to plain NumPy
+    njit = None
+
+# Sample rate faster-whisper expects for raw sample input
+WHISPER_SAMPLE_RATE = 16000
+
+# Number of preallocated audio blocks shared by the callback and the loop
+RING_SLOTS = 8
+
+# How often the latest audio level is forwarded to the GUI
+LEVEL_EMIT_INTERVAL_MS = 50
+
+
+def _mean_square_kernel(buf) -> float:
+    """Mean square of an int16 block, normalized to 0.0-1.0 (JIT-compiled when numba is available)."""
+    acc = 0.0
+    for x in buf:
+        v = float(x)
+        acc += v * v
+    return acc / buf.size / (32768.0 * 32768.0)
+
+
+if njit is not None:
+    _mean_square_kernel = njit(cache=True, fastmath=True)(_mean_square_kernel)
+
 
 class VoiceInputWorker(QObject):
     """Worker that handles speech recognition using sounddevice."""
@@ -19,10 +54,28 @@ class VoiceInputWorker(QObject):
         self.block_size = block_size
         
         self._recognizer = sr.Recognizer()
+        self._whisper = None
+        # Cleared for good if the local model fails to load
+        self._use_local_asr = WhisperModel is not None and sample_rate == WHISPER_SAMPLE_RATE
+        # Recognition runs here so the capture loop keeps draining audio
+        self._executor = ThreadPoolExecutor(max_workers=1)
         self._is_running = False
         self._stop_event = threading.Event()
-        self._audio_queue = queue.Queue()
+        # Ring of preallocated blocks: the audio callback only copies into a
+        # slot and bumps _write_idx, so it never allocates or takes a lock
+        self._ring = np.empty((RING_SLOTS, block_size), dtype=np.int16)
+        self._write_idx = 0
+        self._read_idx = 0
+        self._has_data = threading.Event()
         self._thread = None
+        # The capture thread only stores the level and bumps _level_seq; this
+        # GUI-thread timer forwards it if a new block arrived since last time
+        self._latest_level = 0.0
+        self._level_seq = 0
+        self._emitted_level_seq = 0
+        self._level_timer = QTimer(self)
+        self._level_timer.setInterval(LEVEL_EMIT_INTERVAL_MS)
+        self._level_timer.timeout.connect(self._emit_level)
 
     def start(self):
         """Start the background listening process."""
@@ -33,12 +86,14 @@ class VoiceInputWorker(QObject):
         self._stop_event.clear()
         self._thread = threading.Thread(target=self._run_loop, daemon=True)
         self._thread.start()
+        self._level_timer.start()
         self.listening_started.emit()
 
     def stop(self):
         """Stop listening."""
         self._is_running = False
         self._stop_event.set()
+        self._level_timer.stop()
         if self._thread:
             self._thread.join(timeout=1.0)
         self.listening_ended.emit()
@@ -48,6 +103,7 @@ class VoiceInputWorker(QObject):
         # VAD Parameters
         silence_threshold = 0.01  # Lowered sensitivity
         silence_duration = 3.0    # Slightly shorter duration
+        silence_threshold_sq = silence_threshold * silence_threshold
         speech_buffer = []
         is_speaking = False
         silence_start_time = None
@@ -64,69 +120,97 @@ class VoiceInputWorker(QObject):
                 print("DEBUG: Stream opened")
                 
                 while not self._stop_event.is_set():
-                    try:
-                        # Get audio data from queue
-                        data = self._audio_queue.get(timeout=0.5)
-                        
-                        # Calculate audio level (RMS)
-                        # Normalize 16-bit int to 0.0-1.0
-                        floats = data.astype(np.float32) / 32768.0
-                        rms = np.sqrt(np.mean(floats**2))
-                        self.audio_level_changed.emit(float(rms * 10.0)) # Boost more for visual
-                        
-                        if rms > silence_threshold:
-                            if not is_speaking:
-                                print(f"DEBUG: Speech detected! (RMS: {rms:.4f})")
-                            is_speaking = True
-                            silence_start_time = None
-                            speech_buffer.append(data)
-                        else:
-                            if is_speaking:
-                                speech_buffer.append(data)
-                                if silence_start_time is None:
-                                    import time
-                                    silence_start_time = time.time()
-                                else:
-                                    import time
-                                    if time.time() - silence_start_time > silence_duration:
-                                        # Silence timeout reached, process speech
-                                        print("DEBUG: Processing speech...")
-                                        self._process_speech(speech_buffer)
-                                        speech_buffer = []
-                                        is_speaking = False
-                                        silence_start_time = None
-                    except queue.Empty:
+                    # Get next audio block from the ring
+                    data = self._read_block(timeout=0.5)
+                    if data is None:
                         continue
+                    
+                    # Calculate audio level (mean square, 0.0-1.0)
+                    if njit is not None:
+                        mean_square = _mean_square_kernel(data)
+                    else:
+                        # Sum of squares in int64 (no float temp)
+                        samples = data.astype(np.int64)
+                        mean_square = np.dot(samples, samples) / samples.size / (32768.0 * 32768.0)
+                    self._latest_level = math.sqrt(mean_square) * 10.0 # RMS, boosted for visual
+                    self._level_seq += 1  # After the level, so the timer never sees a stale one
+                    
+                    # VAD compares squared values, no sqrt needed
+                    if mean_square > silence_threshold_sq:
+                        if not is_speaking:
+                            print(f"DEBUG: Speech detected! (RMS: {math.sqrt(mean_square):.4f})")
+                        is_speaking = True
+                        silence_start_time = None
+                        speech_buffer.append(data.copy())  # Slot gets reused
+                    else:
+                        if is_speaking:
+                            speech_buffer.append(data.copy())  # Slot gets reused
+                            if silence_start_time is None:
+                                silence_start_time = time.monotonic()
+                            else:
+                                if time.monotonic() - silence_start_time > silence_duration:
+                                    # Silence timeout reached, process speech
+                                    print("DEBUG: Processing speech...")
+                                    self._process_speech(speech_buffer)
+                                    speech_buffer = []
+                                    is_speaking = False
+                                    silence_start_time = None
                         
         except Exception as e:
             msg = f"Audio stream error: {e}"
             print(msg)
             self.error_occurred.emit(msg)
 
+    def _emit_level(self):
+        """Forward the most recent audio level (runs on the GUI thread)."""
+        seq = self._level_seq
+        if seq == self._emitted_level_seq:
+            return  # No new block since the last emit
+        self._emitted_level_seq = seq
+        self.audio_level_changed.emit(self._latest_level)
+
     def _audio_callback(self, indata, frames, time, status):
         """Sounddevice callback."""
         if status:
             print(status)
-        self._audio_queue.put(indata.copy())
+        np.copyto(self._ring[self._write_idx % RING_SLOTS], indata[:, 0])
+        self._write_idx += 1
+        self._has_data.set()
+
+    def _read_block(self, timeout: float):
+        """Return the oldest unread block (a view into the ring), or None on timeout."""
+        if self._read_idx == self._write_idx:
+            self._has_data.clear()
+            # Re-check after clearing so a block written in between isn't missed
+            if self._read_idx == self._write_idx and not self._has_data.wait(timeout):
+                return None
+            if self._read_idx == self._write_idx:
+                return None
+        
+        # Skip blocks the callback has already overwritten
+        if self._write_idx - self._read_idx > RING_SLOTS:
+            self._read_idx = self._write_idx - RING_SLOTS
+        
+        data = self._ring[self._read_idx % RING_SLOTS]
+        self._read_idx += 1
+        return data
 
     def _process_speech(self, valid_frames):
-        """Convert frames to AudioData and recognize."""
+        """Hand the utterance to the recognition thread and return immediately."""
         if not valid_frames:
             return
 
         # Concatenate all numpy arrays
         audio_data = np.concatenate(valid_frames)
-        
-        # Convert to bytes
-        audio_bytes = audio_data.tobytes()
-        
-        # Create SR AudioData
-        # width=2 for 16-bit int
-        sr_audio = sr.AudioData(audio_bytes, self.sample_rate, 2)
-        
+        self._executor.submit(self._run_asr, audio_data)
+
+    def _run_asr(self, audio_data):
+        """Recognize an utterance (runs on the recognition thread)."""
         try:
-            # Recognize
-            text = self._recognizer.recognize_google(sr_audio)
+            if self._use_local_asr and self._load_whisper():
+                text = self._recognize_local(audio_data)
+            else:
+                text = self._recognize_google(audio_data)
             if text:
                 self.text_recognized.emit(text)
         except sr.UnknownValueError:
@@ -136,6 +220,32 @@ class VoiceInputWorker(QObject):
         except Exception as e:
             self.error_occurred.emit(f"Recognition Error: {e}")
 
+    def _load_whisper(self) -> bool:
+        """Load the local faster-whisper model on first use; False if it can't be."""
+        if self._whisper is None:
+            try:
+                # int8 weights: half the memory of fp16, fast on CPU
+                self._whisper = WhisperModel("small.en", device="auto", compute_type="int8")
+            except Exception as e:
+                # e.g. offline first run or no int8 support; don't retry per utterance
+                print(f"Local speech recognition unavailable, using Google: {e}")
+                self._use_local_asr = False
+                return False
+        return True
+
+    def _recognize_local(self, audio_data) -> str:
+        """Recognize with the local faster-whisper model."""
+        samples = audio_data.reshape(-1).astype(np.float32) / 32768.0
+        segments, _ = self._whisper.transcribe(samples, language="en")
+        return " ".join(segment.text.strip() for segment in segments).strip()
+
+    def _recognize_google(self, audio_data) -> str:
+        """Recognize with the Google Web Speech API."""
+        # Create SR AudioData
+        # width=2 for 16-bit int
+        sr_audio = sr.AudioData(audio_data.tobytes(), self.sample_rate, 2)
+        return self._recognizer.recognize_google(sr_audio)
+
 class VoiceInputManager(QObject):
     """Manager interface."""
     text_recognized = Signal(str)